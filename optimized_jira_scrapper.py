@@ -1,8 +1,14 @@
 import os
 import time
-import json
+import random
+import threading
+import msgspec
 import requests
+import collections
 import concurrent.futures
+from typing import List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
 from tqdm import tqdm
 from pathlib import Path
 
@@ -14,10 +20,27 @@ BASE_URL = "https://issues.apache.org/jira/rest/api/2/search"
 # Updated: Changed folder name from 'data/jsonl' to 'output'
 OUTPUT_DIR = Path("output")
 CHECKPOINT_DIR = Path("checkpoints")
+PROJECTS = ["ACCUMULO", "ACE", "AMQCPP"]  # Scraped concurrently by main()
 MAX_RESULTS = 50  # Safe value for max results for each request
 MAX_RETRIES = 5
 RETRY_BACKOFF = 5
-MAX_WORKERS = 5  # Safe number of concurrent requests
+MAX_BACKOFF = 60  # Upper bound for a single exponential backoff sleep
+MAX_RETRY_AFTER = 120  # Upper bound for a server-provided Retry-After
+# Safe number of concurrent requests per project; raise via JIRA_MAX_WORKERS if the server allows more
+MAX_WORKERS = int(os.getenv("JIRA_MAX_WORKERS", "5"))
+# Checkpoints are persisted after this many completed pages or seconds, whichever comes first
+CHECKPOINT_EVERY_PAGES = 20
+CHECKPOINT_EVERY_SECONDS = 10
+# Client-side request rate shared by all workers; halved on a 429 burst, then ramped back up
+MIN_REQUESTS_PER_SECOND = 0.2
+REQUESTS_PER_SECOND = max(MIN_REQUESTS_PER_SECOND, float(os.getenv("JIRA_REQUESTS_PER_SECOND", "10")))
+RATE_RECOVERY_SUCCESSES = 20  # Successful requests needed before each step back up
+RATE_RECOVERY_STEP = 0.5  # req/s added per step, up to REQUESTS_PER_SECOND
+MIN_RATE_LIMIT_WINDOW = 1  # Seconds a 429 burst lasts at least, even with Retry-After: 0
+# Output files use a large buffer so records reach the OS in few, big write() calls
+WRITE_BUFFER_SIZE = 1 << 20
+# Only the fields transform_issue reads; keep the two in sync
+ISSUE_FIELDS = "summary,description,status,reporter,assignee,priority,labels,created,updated,comment,project"
 
 # Creates the 'output' folder and the 'checkpoints' folder
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -30,40 +53,222 @@ JIRA_API_TOKEN = os.getenv("JIRA_API_TOKEN")
 #required for private jira
 AUTH = (JIRA_USERNAME, JIRA_API_TOKEN) if JIRA_USERNAME and JIRA_API_TOKEN else None
 
+# Shared session so every page request reuses pooled keep-alive connections
+# instead of paying a fresh TCP + TLS handshake per call.
+# Retries are handled by safe_request, so the adapter itself never retries.
+# The pool holds one connection per fetch thread across all concurrently scraped projects.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS * len(PROJECTS), max_retries=0))
+SESSION.auth = AUTH
+SESSION.headers.update({
+    "Accept": "application/json",
+    # JSON compresses very well; advertise every encoding urllib3 can decode here
+    # (gzip/deflate always, br when the optional brotli package is installed)
+    "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+    "User-Agent": "jira-scrapper-for-llm",
+})
+
+
+# ================================================
+# JIRA RESPONSE SCHEMA
+# ================================================
+# Typed subset of the search response, decoded by msgspec straight into compact
+# structs. Unknown keys are ignored; anything JIRA may send as null is Optional.
+
+class Named(msgspec.Struct):
+    """A JIRA object referenced by its name (status, priority)."""
+    name: Optional[str] = None
+
+
+class User(msgspec.Struct):
+    displayName: Optional[str] = None
+
+
+class ProjectRef(msgspec.Struct):
+    key: Optional[str] = None
+
+
+class Comment(msgspec.Struct):
+    body: Optional[str] = None
+
+
+class CommentPage(msgspec.Struct):
+    comments: List[Comment] = []
+
+
+class Fields(msgspec.Struct):
+    """The issue fields requested via ISSUE_FIELDS."""
+    project: Optional[ProjectRef] = None
+    summary: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[Named] = None
+    reporter: Optional[User] = None
+    assignee: Optional[User] = None
+    priority: Optional[Named] = None
+    labels: Optional[List[Optional[str]]] = None
+    created: Optional[str] = None
+    updated: Optional[str] = None
+    comment: Optional[CommentPage] = None
+
+
+class Issue(msgspec.Struct):
+    key: Optional[str] = None
+    fields: Fields = msgspec.field(default_factory=Fields)
+
+
+class SearchPage(msgspec.Struct):
+    total: int = 0
+    # None stands in for an issue that was skipped because it did not fit the schema
+    issues: List[Optional[Issue]] = []
+
+
+class RawSearchPage(msgspec.Struct):
+    """A search page with its issues left undecoded, so they can be validated one by one."""
+    total: int = 0
+    issues: List[msgspec.Raw] = []
+
+
+# Decoders/encoders are reusable and thread-safe; build them once
+PAGE_DECODER = msgspec.json.Decoder(SearchPage)
+RAW_PAGE_DECODER = msgspec.json.Decoder(RawSearchPage)
+ISSUE_DECODER = msgspec.json.Decoder(Issue)
+JSON_ENCODER = msgspec.json.Encoder()
+
+
+# ================================================
+# CLIENT-SIDE RATE LIMITING
+# ================================================
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by all fetch threads.
+    acquire() blocks until a token is available, pacing requests to `rate` per second
+    with bursts of up to `capacity`, so requests stay under the server limit instead
+    of discovering it through 429 responses.
+    The rate is halved at most once per rate-limit window and recovers additively
+    towards `max_rate` while requests keep succeeding.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.max_rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        # 429s before this moment belong to a burst that has already been reacted to
+        self.cooldown_until = 0.0
+        self.successes = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Takes one token, sleeping until the bucket has refilled enough."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def slow_down(self, window):
+        """
+        Halves the rate and drains the bucket after the server signals a rate limit.
+        Further 429s within `window` seconds (the Retry-After period) come from the
+        same burst and do not lower the rate again.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.successes = 0
+            if now < self.cooldown_until:
+                return
+            self.rate = max(MIN_REQUESTS_PER_SECOND, self.rate / 2)
+            self.tokens = 0
+            self.cooldown_until = now + max(window, MIN_RATE_LIMIT_WINDOW)
+
+    def record_success(self):
+        """Steps the rate back up by RATE_RECOVERY_STEP after every RATE_RECOVERY_SUCCESSES successes."""
+        with self.lock:
+            if self.rate >= self.max_rate or time.monotonic() < self.cooldown_until:
+                return
+            self.successes += 1
+            if self.successes >= RATE_RECOVERY_SUCCESSES:
+                self.rate = min(self.max_rate, self.rate + RATE_RECOVERY_STEP)
+                self.successes = 0
+
+
+RATE_LIMITER = TokenBucket(REQUESTS_PER_SECOND, capacity=MAX_WORKERS)
+
 
 # ================================================
 # SAFE REQUEST FUNCTION (with retries and backoff)
 # ================================================
 
-def safe_request(url, params=None):
+def backoff_seconds(attempt):
+    """
+    Exponential backoff with jitter for the given 1-based attempt.
+    The jitter spreads out retries from workers that failed at the same moment.
+    """
+    return min(MAX_BACKOFF, RETRY_BACKOFF * (2 ** (attempt - 1))) * random.uniform(0.5, 1.5)
+
+
+def retry_after_seconds(resp):
+    """Returns the response's Retry-After delay in seconds (capped), or None if absent or not numeric."""
+    try:
+        return min(MAX_RETRY_AFTER, max(0, int(resp.headers["Retry-After"])))
+    except (KeyError, ValueError):
+        return None
+
+
+def safe_request(url, params=None, decode=msgspec.json.decode):
     """
     Makes resilient HTTP GET requests with:
     - Retries for 429 and 5xx
     - Exponential backoff
     - Timeout and error handling
+    Uses the shared SESSION so connections are reused across pages, and waits on
+    RATE_LIMITER before every attempt.
+    The response body is decoded with `decode` (untyped JSON by default).
     """
     for attempt in range(1, MAX_RETRIES + 1):
+        RATE_LIMITER.acquire()
         try:
-            resp = requests.get(url, params=params, auth=AUTH, timeout=30)
+            # (connect, read) timeouts: fail fast on unreachable hosts, allow slow pages
+            resp = SESSION.get(url, params=params, timeout=(5, 30))
             if resp.status_code == 200:
-                return resp.json()
+                RATE_LIMITER.record_success()
+                # Decode the whole body in one C call: with the fields whitelist and compression
+                # a page is small, so an incremental parser would be slower and save little memory
+                return decode(resp.content)
             elif resp.status_code == 429:
-                retry_after = int(resp.headers.get("Retry-After", 60))
-                print(f"[429] Rate limit hit. Sleeping {retry_after}s...")
-                time.sleep(retry_after)
+                retry_after = retry_after_seconds(resp)
+                if retry_after is None:
+                    retry_after = 60
+                # Small jitter so workers throttled together don't all resume together
+                wait = retry_after + random.uniform(0, 1)
+                RATE_LIMITER.slow_down(retry_after)
+                tqdm.write(f"[429] Rate limit hit. Sleeping {wait:.1f}s (client rate now {RATE_LIMITER.rate:g} req/s)...")
+                time.sleep(wait)
             elif 500 <= resp.status_code < 600:
-                wait = min(RETRY_BACKOFF * attempt, 60)
-                print(f"[{resp.status_code}] Server error. Retrying in {wait}s (attempt {attempt}/{MAX_RETRIES})...")
+                retry_after = retry_after_seconds(resp)
+                wait = backoff_seconds(attempt) if retry_after is None else retry_after
+                tqdm.write(f"[{resp.status_code}] Server error. Retrying in {wait:.1f}s (attempt {attempt}/{MAX_RETRIES})...")
                 time.sleep(wait)
             else:
-                print(f"[{resp.status_code}] Unexpected response from server: {url}")
+                tqdm.write(f"[{resp.status_code}] Unexpected response from server: {url}")
                 # For 403 (Forbidden), 404 (Not Found), etc., stop and return None
                 return None
-        except requests.exceptions.RequestException as e:
-            wait = min(RETRY_BACKOFF * attempt, 60)
-            print(f"Network error: {e}. Retrying in {wait}s (attempt {attempt}/{MAX_RETRIES})...")
+        except msgspec.ValidationError as e:
+            # Well-formed JSON that doesn't fit the expected schema won't change on retry
+            tqdm.write(f"Unexpected response shape from server: {e} (URL={url})")
+            return None
+        except (requests.exceptions.RequestException, msgspec.DecodeError) as e:
+            wait = backoff_seconds(attempt)
+            tqdm.write(f"Network error: {e}. Retrying in {wait:.1f}s (attempt {attempt}/{MAX_RETRIES})...")
             time.sleep(wait)
-    print(f" Failed after {MAX_RETRIES} retries for URL={url}")
+    tqdm.write(f" Failed after {MAX_RETRIES} retries for URL={url}")
     return None
 
 
@@ -72,54 +277,131 @@ def safe_request(url, params=None):
 # ================================================
 
 def load_checkpoint(project_key):
-    """Loads the last startAt position for a project from a checkpoint file."""
+    """
+    Loads the last startAt position for a project from a checkpoint file.
+    Returns (start_at, jsonl_offset); jsonl_offset is the size of the JSONL output at
+    that position, or None for a missing or pre-offset checkpoint.
+    """
     f = CHECKPOINT_DIR / f"{project_key}_checkpoint.json"
     if f.exists():
         try:
-            with open(f, "r") as fp:
-                return json.load(fp).get("last_startAt", 0)
-        except json.JSONDecodeError:
-            print(f"Warning: Checkpoint file for {project_key} is corrupted. Starting from 0.")
-            return 0
-    return 0
+            data = msgspec.json.decode(f.read_bytes())
+            return data.get("last_startAt", 0), data.get("jsonl_offset")
+        except msgspec.DecodeError:
+            tqdm.write(f"Warning: Checkpoint file for {project_key} is corrupted. Starting from 0.")
+            return 0, None
+    return 0, None
 
 
-def save_checkpoint(project_key, start_at):
-    """Saves the current startAt position for a project."""
+def save_checkpoint(project_key, start_at, jsonl_offset):
+    """
+    Saves the current startAt position for a project, with the JSONL output size
+    that corresponds to it.
+    Writes to a temporary file and renames it over the checkpoint, so a crash
+    mid-write can never leave a truncated checkpoint behind.
+    """
     f = CHECKPOINT_DIR / f"{project_key}_checkpoint.json"
-    with open(f, "w") as fp:
-        json.dump({"last_startAt": start_at}, fp)
+    tmp = f.with_suffix(".tmp")
+    tmp.write_bytes(JSON_ENCODER.encode({"last_startAt": start_at, "jsonl_offset": jsonl_offset}))
+    os.replace(tmp, f)
+
+
+class CheckpointTracker:
+    """
+    Writes a project's pages to the JSONL output strictly in page order and persists
+    the resume position in batches.
+    Pages that finish out of order wait in memory until every earlier page has been
+    written, so the saved position and byte offset always describe a complete,
+    duplicate-free prefix of the output file.
+    """
+
+    def __init__(self, project_key, start_at, output):
+        self.project_key = project_key
+        # Next page to write; pages are keyed by their start_at
+        self.position = start_at
+        # Index just past the last written record (short of position after a short final page)
+        self.resume_at = start_at
+        self.saved_position = start_at
+        # start_at -> (encoded records, record count, page size) for pages waiting on an earlier page
+        self.ready = {}
+        self.written = 0
+        self.pending = 0
+        self.last_save = time.monotonic()
+        # Output file flushed before each save so the checkpoint never runs ahead of the data
+        self.output = output
+
+    def add_page(self, start_at, data, count, size):
+        """
+        Queues an encoded page of `count` records, writes every page that is now in order,
+        and saves if a batch is due. `size` is the number of issues the page covered,
+        including any that were skipped.
+        """
+        self.ready[start_at] = (data, count, size)
+        while self.position in self.ready:
+            data, count, size = self.ready.pop(self.position)
+            self.output.write(data)
+            self.written += count
+            self.resume_at = self.position + size
+            self.position += MAX_RESULTS
+            self.pending += 1
+        if self.pending >= CHECKPOINT_EVERY_PAGES or time.monotonic() - self.last_save >= CHECKPOINT_EVERY_SECONDS:
+            self.flush()
+
+    def flush(self):
+        """Saves the current position and output size if the position moved since the last save."""
+        if self.resume_at != self.saved_position:
+            self.output.flush()
+            save_checkpoint(self.project_key, self.resume_at, self.output.tell())
+            self.saved_position = self.resume_at
+        self.pending = 0
+        self.last_save = time.monotonic()
 
 
 # ================================================
 # FETCH PAGINATED DATA
 # ================================================
 
-def get_total_issues(project_key):
+def decode_page(body, start_at):
     """
-    Fetches the total number of issues for a given project.
+    Decodes a search page into a SearchPage.
+    If an issue does not fit the schema, the issues are decoded one by one instead and
+    each bad one is replaced by None, so a single malformed issue can't fail its page.
+    A page whose envelope doesn't fit still raises msgspec.ValidationError.
     """
-    # Request only 1 result to get the 'total' count efficiently
-    params = {"jql": f"project={project_key}", "maxResults": 1}
-    data = safe_request(BASE_URL, params)
-    return data.get("total", 0) if data else 0
+    try:
+        return PAGE_DECODER.decode(body)
+    except msgspec.ValidationError:
+        pass
+    raw = RAW_PAGE_DECODER.decode(body)
+    issues = []
+    for index, item in enumerate(raw.issues, start_at):
+        try:
+            issues.append(ISSUE_DECODER.decode(item))
+        except msgspec.ValidationError as e:
+            tqdm.write(f"Skipping malformed issue at index {index}: {e}")
+            issues.append(None)
+    return SearchPage(total=raw.total, issues=issues)
 
 
 def fetch_page(project_key, start_at):
     """
     Fetches a single page of issues for a project.
+    Returns (start_at, issues, total), where total is the project's issue count;
+    issues is None if the page could not be fetched, and holds None for each
+    issue that was skipped as malformed.
     """
     params = {
         "jql": f"project={project_key}",
         "startAt": start_at,
         "maxResults": MAX_RESULTS,
-        "expand": "comments"
+        # Whitelisting fields skips every custom field; comments come back in "comment"
+        "fields": ISSUE_FIELDS
     }
-    data = safe_request(BASE_URL, params)
-    if not data:
-        # If request fails, return the current start_at and an empty list
-        return start_at, []
-    return start_at, data.get("issues", [])
+    page = safe_request(BASE_URL, params, decode=lambda body: decode_page(body, start_at))
+    if page is None:
+        # If request fails, return the current start_at, no issues and no total
+        return start_at, None, 0
+    return start_at, page.issues, page.total
 
 
 # ================================================
@@ -128,35 +410,40 @@ def fetch_page(project_key, start_at):
 
 def transform_issue(issue):
     """
-    Convert a single JIRA issue into a structured JSONL record.
+    Convert a single JIRA issue (a decoded Issue struct) into a structured JSONL record.
     Includes metadata, text, and derived tasks for LLM training/prompting.
     """
-    fields = issue.get("fields", {})
-    key = issue.get("key", "")
-    project = fields.get("project", {}).get("key", "")
-    summary = fields.get("summary", "")
-    # Use empty string if description is None
-    description = fields.get("description") or ""
-    status = fields.get("status", {}).get("name", "")
-    reporter = fields.get("reporter", {}).get("displayName", "")
-    # Check if assignee exists before getting displayName
-    assignee = fields.get("assignee", {}).get("displayName", "Unassigned") if fields.get("assignee") else "Unassigned"
-    priority = fields.get("priority", {}).get("name", "")
-    labels = fields.get("labels", [])
-    created = fields.get("created", "")
-    updated = fields.get("updated", "")
+    fields = issue.fields
+    key = issue.key or ""
+    # Nested names may themselves be null, hence the `or ""` fallbacks
+    project = (fields.project.key or "") if fields.project else ""
+    # str.join below needs a string even if the summary is null
+    summary = fields.summary or ""
+    # Use empty string if description is None; strip once and reuse everywhere
+    description = (fields.description or "").strip()
+    status = (fields.status.name or "") if fields.status else ""
+    reporter = (fields.reporter.displayName or "") if fields.reporter else ""
+    # Unassigned issues have a null assignee
+    assignee = (fields.assignee.displayName or "Unassigned") if fields.assignee else "Unassigned"
+    priority = (fields.priority.name or "") if fields.priority else ""
+    labels = [label for label in fields.labels if label] if fields.labels else []
+    created = fields.created or ""
+    updated = fields.updated or ""
 
     # Extract all comments as plain text
-    comments_data = fields.get("comment", {}).get("comments", [])
+    comments_data = fields.comment.comments if fields.comment else []
     # Filter out comments with no body, and strip whitespace
-    comments = [c.get("body", "").strip() for c in comments_data if c.get("body")]
+    comments = [c.body.strip() for c in comments_data if c.body]
 
-    # Combine text for downstream NLP tasks
-    full_text = f"{summary}\n\nDescription:\n{description}\n\nComments:\n" + "\n".join(comments)
+    # Combine text for downstream NLP tasks with a single join over the parts
+    # (strip() returns the same object when there is nothing to strip)
+    full_text = "".join((summary, "\n\nDescription:\n", description, "\n\nComments:\n", "\n".join(comments))).strip()
 
     # Derived LLM tasks (examples of prompts for training data)
+    # The summarization prompt is kept as a template over the record's "text"
+    # field rather than a third copy of the issue body; fill it in at read time.
     derived_tasks = {
-        "summarization": f"Summarize this issue: {full_text}",
+        "summarization_template": "Summarize this issue: {text}",
         "classification": f"Classify the issue '{summary}' into categories like 'Bug', 'Improvement', 'Task', or 'Feature'.",
         "qna": f"Q: What is the main problem described in issue {key}?\nA: {description[:400]}"
     }
@@ -172,79 +459,186 @@ def transform_issue(issue):
         "labels": labels,
         "created": created,
         "updated": updated,
-        "description": description.strip(),
+        "description": description,
         "comments": comments,
-        "text": full_text.strip(),
+        "text": full_text,
         "derived_tasks": derived_tasks
     }
 
 
 # ================================================
-# SCRAPE ONE PROJECT (CONCURRENT)
+# OUTPUT
 # ================================================
 
-def scrape_project(project_key):
+def jsonl_to_json_array(jsonl_file, json_file):
     """
-    Scrapes all issues for a single project concurrently using thread pooling.
-    Saves output in both JSON and JSONL formats.
+    Builds a JSON array file from a JSONL file, one line at a time.
+    Lines are already encoded, so nothing is re-serialized or held in memory.
+    Returns the number of records written.
     """
-    print(f"\n Scraper initiated for project: {project_key}")
+    count = 0
+    with open(jsonl_file, "rb", buffering=WRITE_BUFFER_SIZE) as src, \
+            open(json_file, "wb", buffering=WRITE_BUFFER_SIZE) as dst:
+        dst.write(b"[")
+        for line in src:
+            if count:
+                dst.write(b",")
+            dst.write(line)
+            count += 1
+        dst.write(b"]")
+    return count
 
-    total = get_total_issues(project_key)
 
-    # === MODIFICATION START: Print total issues ===
-    print(f" Total issues found for {project_key}: {total}")
-    # === MODIFICATION END ===
+# ================================================
+# SCRAPE ONE PROJECT (CONCURRENT)
+# ================================================
+
+def scrape_project(project_key, position=0):
+    """
+    Scrapes all issues for a single project concurrently using thread pooling.
+    Streams records to JSONL as pages complete (appending when resuming from a
+    checkpoint), then derives the JSON array from it.
+    `position` is the tqdm line to draw the progress bar on when several
+    projects are scraped at once.
+    Returns the number of records written in this run.
+    """
+    # Messages go through tqdm.write (here and in the helpers this calls) so they print
+    # above the progress bars of every project being scraped at the same time
+    tqdm.write(f"\n Scraper initiated for project: {project_key}")
 
-    if total == 0:
-        print(f" No issues to scrape for {project_key}")
-        return []
-
-    # Calculate starting point and pages based on checkpoint
-    start_checkpoint = load_checkpoint(project_key)
-    pages = [start for start in range(start_checkpoint, total, MAX_RESULTS)]
-    results = []
-
-    print(f" Resuming from issue index {start_checkpoint}. Pages to fetch: {len(pages)}")
-
-    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        # Create a map of Future objects to their corresponding start_at index
-        futures = {executor.submit(fetch_page, project_key, start): start for start in pages}
-
-        with tqdm(total=len(pages), desc=f"{project_key} progress", unit="page") as pbar:
-            for future in concurrent.futures.as_completed(futures):
-                start_at = futures[future]
-                try:
-                    # The result is a tuple: (start_at, issues_list)
-                    _, issues = future.result()
-                    if issues:
-                        for issue in issues:
-                            results.append(transform_issue(issue))
-                        # Update checkpoint only if the page fetch was successful
-                        save_checkpoint(project_key, start_at + MAX_RESULTS)
-                except Exception as e:
-                    # This catches exceptions from fetch_page's execution
-                    print(f"Error processing future for page {start_at}: {e}")
-
-                pbar.update(1)
-
-    # Save structured JSON array (.json)
     json_file = OUTPUT_DIR / f"{project_key.lower()}_issues.json"
-    with open(json_file, "w", encoding="utf-8") as f:
-        # Write the entire list of dictionaries as a single JSON array
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    jsonl_file = OUTPUT_DIR / f"{project_key.lower()}_issues.jsonl"
 
-    print(f" Finished {project_key}: {len(results)} structured records written to {json_file}")
+    start_checkpoint, jsonl_offset = load_checkpoint(project_key)
+    if start_checkpoint:
+        # Only the JSONL prefix recorded with the checkpoint is known to be complete;
+        # cut off anything written after it (a partly flushed buffer, pages past a kill)
+        if jsonl_offset is None or not jsonl_file.exists() or jsonl_file.stat().st_size < jsonl_offset:
+            tqdm.write(f"Warning: Checkpoint for {project_key} does not match {jsonl_file}. Starting from 0.")
+            start_checkpoint = 0
+        else:
+            os.truncate(jsonl_file, jsonl_offset)
 
-    # Save structured JSON Lines (.jsonl)
-    jsonl_file = OUTPUT_DIR / f"{project_key.lower()}_issues.jsonl"
-    with open(jsonl_file, "w", encoding="utf-8") as f:
-        for r in results:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    # The first page also carries the total, so no separate count request is needed
+    _, first_issues, total = fetch_page(project_key, start_checkpoint)
 
-    print(f" Finished {project_key}: {len(results)} structured records written to {jsonl_file}")
+    if first_issues is None:
+        tqdm.write(f" Could not fetch issues for {project_key}. Rerun to resume from issue index {start_checkpoint}.")
+        return 0
 
-    return results
+    # === MODIFICATION START: Print total issues ===
+    tqdm.write(f" Total issues found for {project_key}: {total}")
+    # === MODIFICATION END ===
+
+    if total == 0:
+        tqdm.write(f" No issues to scrape for {project_key}")
+        return 0
+
+    if start_checkpoint >= total:
+        # Everything up to the checkpoint is already on disk; only rebuild the .json and leave
+        # the checkpoint alone, so reruns of a finished project don't walk it past the real end
+        tqdm.write(f" {project_key} is already complete up to issue index {start_checkpoint}.")
+        count = jsonl_to_json_array(jsonl_file, json_file)
+        tqdm.write(f" Finished {project_key}: {count} structured records written to {json_file}")
+        return 0
+
+    # Calculate the remaining pages after the first one, based on checkpoint
+    pages = range(start_checkpoint + MAX_RESULTS, total, MAX_RESULTS)
+
+    tqdm.write(f" Resuming from issue index {start_checkpoint}. Pages to fetch: {len(pages) + 1}")
+
+    # Save structured JSON Lines (.jsonl) incrementally, in page order, as pages complete.
+    # Only a bounded window of pages is ever held, so memory stays flat regardless of project size.
+    # When resuming, the checkpointed prefix is already on disk, so append to it.
+    jsonl_mode = "ab" if start_checkpoint else "wb"
+    # Network threads only fetch and parse; transform_issue runs here on the coordinating
+    # thread, which is cheap next to a page fetch and overlaps with the fetches still in flight.
+    with open(jsonl_file, jsonl_mode, buffering=WRITE_BUFFER_SIZE) as jsonl_fp, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        checkpoint = CheckpointTracker(project_key, start_checkpoint, jsonl_fp)
+
+        def write_page(start_at, issues):
+            """Transforms one page of issues and hands it to the checkpoint tracker for writing."""
+            # Encode the whole page into one buffer in place, then hand it over in a single write
+            buf = bytearray()
+            count = 0
+            for issue in issues:
+                # Malformed issues were already reported by decode_page; leave them out
+                if issue is None:
+                    continue
+                JSON_ENCODER.encode_into(transform_issue(issue), buf, -1)
+                buf.extend(b"\n")
+                count += 1
+            # Only successfully fetched pages reach the output and advance the checkpoint
+            checkpoint.add_page(start_at, buf, count, len(issues))
+
+        # Pages are submitted lazily so only a bounded number of Futures exist at once,
+        # however many pages the project has
+        pending = collections.deque(pages)
+        # Map of in-flight Future objects to their corresponding start_at index
+        inflight = {}
+        # Lowest page that failed; later pages cannot be written past it this run
+        failed_at = None
+
+        def submit_more():
+            """
+            Tops up the executor to 2 * MAX_WORKERS queued or running pages, while keeping
+            pages fetched ahead of a slow one (waiting in the tracker) bounded too.
+            """
+            while pending and len(inflight) < 2 * MAX_WORKERS \
+                    and len(inflight) + len(checkpoint.ready) < 4 * MAX_WORKERS:
+                start = pending.popleft()
+                inflight[executor.submit(fetch_page, project_key, start)] = start
+
+        # Redraw at most twice a second; several project bars share tqdm's display lock
+        with tqdm(total=len(pages) + 1, desc=f"{project_key} progress", unit="page", position=position,
+                  mininterval=0.5) as pbar:
+            # Start fetching the remaining pages while the first one is transformed
+            submit_more()
+            write_page(start_checkpoint, first_issues)
+            del first_issues
+            pbar.update(1)
+
+            while inflight:
+                done, _ = concurrent.futures.wait(inflight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    start_at = inflight.pop(future)
+                    try:
+                        # The result is a tuple: (start_at, issues_list, total)
+                        _, issues, _ = future.result()
+                    except Exception as e:
+                        # This catches exceptions from fetch_page's execution
+                        tqdm.write(f"Error processing future for page {start_at}: {e}")
+                        issues = None
+                    if issues is None:
+                        # Nothing after a missing page can be written without leaving a gap,
+                        # so stop scheduling and let the next run resume from here
+                        failed_at = start_at if failed_at is None else min(failed_at, start_at)
+                        pending.clear()
+                    else:
+                        write_page(start_at, issues)
+                        del issues
+
+                # One progress update per batch of completed pages rather than per page
+                pbar.update(len(done))
+                submit_more()
+
+        checkpoint.flush()
+        written = checkpoint.written
+
+    if failed_at is not None:
+        tqdm.write(f" Page at issue index {failed_at} of {project_key} could not be fetched; "
+                   f"{len(checkpoint.ready)} later fetched pages were discarded. "
+                   f"Rerun to resume from issue index {checkpoint.position}.")
+
+    tqdm.write(f" Finished {project_key}: {written} structured records written to {jsonl_file}")
+
+    # Save structured JSON array (.json), derived from the JSONL file
+    count = jsonl_to_json_array(jsonl_file, json_file)
+
+    tqdm.write(f" Finished {project_key}: {count} structured records written to {json_file}")
+
+    return written
 
 
 # ================================================
@@ -252,9 +646,10 @@ def scrape_project(project_key):
 # ================================================
 
 def main():
-    projects = ["ACCUMULO", "ACE", "AMQCPP"]
-    for project in projects:
-        scrape_project(project)
+    # Scrape projects side by side so one project's straggler pages don't leave
+    # the others idle; the session and rate limiter are shared across all of them.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(PROJECTS)) as executor:
+        list(executor.map(scrape_project, PROJECTS, range(len(PROJECTS))))
 
 
 if __name__ == "__main__":